@@ -1,60 +1,182 @@
 """Authentication utilities for user management"""
 
+import os
+import hmac
+import threading
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
 from functools import wraps
-from flask import session, redirect, url_for, jsonify, request
+from flask import g, session, redirect, url_for, jsonify
 from typing import Optional, Callable
 
+# Argon2id is the default for new hashes; bcrypt remains supported for
+# verifying hashes created before the switch (their cost factor, 12 for
+# this app's legacy hashes, is embedded in the stored hash)
+argon2_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt with cost factor 12"""
-    salt = bcrypt.gensalt(rounds=12)
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    """Hash a password using argon2id"""
+    return argon2_hasher.hash(password)
 
 
-def verify_password(password: str, password_hash: str) -> bool:
-    """Verify a password against its hash"""
+def _verify(password: str, password_hash: str) -> bool:
+    """Run the actual hash comparison (argon2 or legacy bcrypt)"""
+    if password_hash.startswith('$argon2'):
+        try:
+            return argon2_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    # A structurally invalid bcrypt hash (blank, truncated, wrong prefix)
+    # can never match; skip the expensive key schedule outright
+    if not password_hash.startswith(('$2a$', '$2b$', '$2y$')) or len(password_hash) != 60:
+        return False
     return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
 
 
-def login_required(f: Callable) -> Callable:
-    """Decorator to require login for routes"""
+# Verified against when a login names an unknown user, so the response
+# takes as long as a real verification (username enumeration resistance).
+# The random password guarantees it can never match.
+_dummy_hash = argon2_hasher.hash(os.urandom(16).hex())
+
+
+def dummy_verify(password: str) -> None:
+    """Burn a verification against a throwaway hash to equalize timing"""
+    _verify(password, _dummy_hash)
+
+
+# Memoize successful verifications so repeat logins within the TTL skip the
+# expensive hash entirely. Keys pair an HMAC of the password (never the
+# plaintext) with the stored hash, so a password change invalidates the
+# entry automatically. Failures are never cached.
+_verify_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_verify_cache_lock = threading.Lock()
+_verify_cache_hmac_key = os.getenv('SECRET_KEY', 'dev-secret-key').encode('utf-8')
+
+
+def _verify_cache_key(password: str, password_hash: str) -> tuple:
+    digest = hmac.new(
+        _verify_cache_hmac_key, password.encode('utf-8'), 'sha256'
+    ).digest()
+    return (digest, password_hash)
+
+
+# Hashing is CPU-bound and would otherwise pin a whole request thread for
+# the full hash time; a shared process pool lets concurrent logins split
+# the cores instead
+hash_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+# Generous upper bound on a single hash/verify; only hit if the pool is
+# badly oversubscribed
+HASH_TIMEOUT_SECONDS = 5
+
+
+def hash_password_async(password: str) -> str:
+    """Hash a password in the worker process pool"""
+    return hash_pool.submit(hash_password, password).result(timeout=HASH_TIMEOUT_SECONDS)
+
+
+def verify_password_async(password: str, password_hash: str) -> bool:
+    """Verify a password in the worker process pool, memoizing successes"""
+    key = _verify_cache_key(password, password_hash)
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            return True
+    result = hash_pool.submit(_verify, password, password_hash).result(
+        timeout=HASH_TIMEOUT_SECONDS
+    )
+    if result:
+        with _verify_cache_lock:
+            _verify_cache[key] = True
+    return result
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Check whether a stored hash should be upgraded to the current scheme"""
+    if not password_hash.startswith('$argon2'):
+        return True
+    return argon2_hasher.check_needs_rehash(password_hash)
+
+
+def load_user_from_session() -> None:
+    """Populate g.user once per request from the session cookie"""
+    user_id = session.get('user_id')
+    if user_id is None:
+        g.user = None
+    else:
+        g.user = {
+            'id': user_id,
+            'username': session.get('username'),
+            'is_admin': session.get('is_admin', False),
+            'must_change_password': session.get('must_change_password', False),
+        }
+
+
+# Page and API routes get separate decorators so the failure response is
+# decided once at registration instead of re-checking request.path per call
+
+
+def html_login_required(f: Callable) -> Callable:
+    """Decorator for page routes: redirect to login when unauthenticated"""
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            if request.path.startswith('/api/'):
-                return jsonify({'error': 'Unauthorized'}), 401
+        if g.user is None:
             return redirect(url_for('login'))
         return f(*args, **kwargs)
 
     return decorated_function
 
 
-def admin_required(f: Callable) -> Callable:
-    """Decorator to require admin privileges for routes"""
+def api_login_required(f: Callable) -> Callable:
+    """Decorator for API routes: 401 JSON when unauthenticated"""
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if g.user is None:
+            return jsonify({'error': 'Unauthorized'}), 401
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def html_admin_required(f: Callable) -> Callable:
+    """Decorator for admin page routes: redirect non-admins away"""
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            if request.path.startswith('/api/'):
-                return jsonify({'error': 'Unauthorized'}), 401
+        if g.user is None:
             return redirect(url_for('login'))
-        if not session.get('is_admin', False):
-            if request.path.startswith('/api/'):
-                return jsonify({'error': 'Forbidden - Admin access required'}), 403
+        if not g.user['is_admin']:
             return redirect(url_for('dashboard'))
         return f(*args, **kwargs)
 
     return decorated_function
 
 
+def api_admin_required(f: Callable) -> Callable:
+    """Decorator for admin API routes: 401/403 JSON on failure"""
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if g.user is None:
+            return jsonify({'error': 'Unauthorized'}), 401
+        if not g.user['is_admin']:
+            return jsonify({'error': 'Forbidden - Admin access required'}), 403
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
 def get_current_user() -> Optional[dict]:
-    """Get current user info from session"""
-    if 'user_id' in session:
-        return {
-            'id': session['user_id'],
-            'username': session['username'],
-            'is_admin': session.get('is_admin', False),
-        }
-    return None
+    """Get current user info loaded by load_user_from_session"""
+    if g.user is None:
+        return None
+    return {
+        'id': g.user['id'],
+        'username': g.user['username'],
+        'is_admin': g.user['is_admin'],
+    }
@@ -1,10 +1,25 @@
 """Database connection and query utilities for PostgreSQL"""
 
 import os
+from contextlib import contextmanager
 from typing import Any, Optional
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+import psycopg2.extensions
+from psycopg2.extras import NamedTupleCursor, RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """Connection that tracks which statements it has PREPAREd
+
+    psycopg2's C connection type cannot hold arbitrary attributes, so the
+    per-connection set of prepared statement names lives on this subclass,
+    handed to the pool as its connection_factory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: set = set()
 
 
 class DatabaseManager:
@@ -12,12 +27,17 @@ class DatabaseManager:
 
     def __init__(self, database_url: str):
         self.database_url = database_url
-        self.pool: Optional[SimpleConnectionPool] = None
+        self.pool: Optional[ThreadedConnectionPool] = None
 
-    def initialize_pool(self, minconn: int = 1, maxconn: int = 10) -> None:
-        """Initialize connection pool"""
+    def initialize_pool(self, minconn: int = 4, maxconn: int = 20) -> None:
+        """Initialize thread-safe connection pool"""
         if self.pool is None:
-            self.pool = SimpleConnectionPool(minconn, maxconn, self.database_url)
+            self.pool = ThreadedConnectionPool(
+                minconn,
+                maxconn,
+                self.database_url,
+                connection_factory=PreparedConnection,
+            )
 
     def get_connection(self):
         """Get connection from pool"""
@@ -30,18 +50,63 @@ class DatabaseManager:
         if self.pool:
             self.pool.putconn(conn)
 
+    def ensure_indexes(self, statements: list[str]) -> None:
+        """Create indexes at startup if they do not already exist
+
+        Runs on an autocommit connection because CREATE INDEX CONCURRENTLY
+        cannot execute inside a transaction block.
+        """
+        conn = self.get_connection()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+        finally:
+            conn.autocommit = False
+            self.return_connection(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor on a single pooled connection for a transaction
+
+        All statements executed on the cursor share one connection and are
+        committed together on exit (or rolled back on error), avoiding a
+        pool checkout and commit per statement.
+        """
+        conn = self.get_connection()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                yield cursor
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self.return_connection(conn)
+
     def execute_query(
-        self, query: str, params: tuple = (), fetch: bool = True
-    ) -> Optional[list[dict[str, Any]]]:
-        """Execute a query and return results"""
+        self,
+        query: str,
+        params: tuple = (),
+        fetch: bool = True,
+        fetch_mode: str = 'dict',
+    ) -> Optional[list[Any]]:
+        """Execute a query and return results
+
+        fetch_mode 'dict' (default) returns RealDictRow mappings; 'ntuple'
+        returns lightweight namedtuples, which avoid per-row dict storage
+        for result sets that are serialized and discarded.
+        """
+        factory = NamedTupleCursor if fetch_mode == 'ntuple' else RealDictCursor
         conn = None
         try:
             conn = self.get_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            with conn.cursor(cursor_factory=factory) as cursor:
                 cursor.execute(query, params)
                 if fetch:
-                    result = cursor.fetchall()
-                    return [dict(row) for row in result]
+                    # RealDictRow is already a mapping; no per-row copy needed
+                    return cursor.fetchall()
                 conn.commit()
                 return None
         except Exception as e:
@@ -52,6 +117,47 @@ class DatabaseManager:
             if conn:
                 self.return_connection(conn)
 
+    def execute_prepared(
+        self,
+        name: str,
+        sql: str,
+        params: tuple = (),
+        fetch: bool = True,
+        one: bool = False,
+    ) -> Any:
+        """Execute a hot query through a server-side prepared statement
+
+        ``sql`` uses $1-style placeholders. The statement is PREPAREd once
+        per pooled connection (tracked on the connection object), so later
+        calls only bind and execute, skipping Postgres's parse/plan step.
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if name not in conn.prepared_statements:
+                    cursor.execute(f'PREPARE {name} AS {sql}')
+                    # Commit so a later rollback cannot discard the PREPARE
+                    conn.commit()
+                    conn.prepared_statements.add(name)
+                if params:
+                    placeholders = ', '.join(['%s'] * len(params))
+                    cursor.execute(f'EXECUTE {name} ({placeholders})', params)
+                else:
+                    cursor.execute(f'EXECUTE {name}')
+                result = None
+                if fetch:
+                    result = cursor.fetchone() if one else cursor.fetchall()
+                conn.commit()
+                return result
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+        finally:
+            if conn:
+                self.return_connection(conn)
+
     def execute_one(
         self, query: str, params: tuple = ()
     ) -> Optional[dict[str, Any]]:
@@ -61,8 +167,7 @@ class DatabaseManager:
             conn = self.get_connection()
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute(query, params)
-                result = cursor.fetchone()
-                return dict(result) if result else None
+                return cursor.fetchone()
         except Exception as e:
             if conn:
                 conn.rollback()
@@ -82,7 +187,7 @@ class DatabaseManager:
                 cursor.execute(query, params)
                 result = cursor.fetchone()
                 conn.commit()
-                return dict(result) if result else None
+                return result
         except Exception as e:
             if conn:
                 conn.rollback()
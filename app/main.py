@@ -1,9 +1,15 @@
 """Main Flask application with all routes and API endpoints"""
 
+import hashlib
+import io
 import os
+import threading
 from datetime import datetime
+import orjson
+from cachetools import TTLCache
 from flask import (
     Flask,
+    g,
     render_template,
     request,
     jsonify,
@@ -11,34 +17,119 @@ from flask import (
     redirect,
     url_for,
 )
+from flask.json.provider import DefaultJSONProvider
+from psycopg2.extras import execute_values
+from app import tasks
 from app.database import DatabaseManager
 from app.auth import (
-    hash_password,
-    verify_password,
-    login_required,
-    admin_required,
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+    dummy_verify,
+    html_login_required,
+    html_admin_required,
+    api_login_required,
+    api_admin_required,
     get_current_user,
+    load_user_from_session,
 )
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson (C encoder, native datetime support)
+
+    NamedTupleCursor rows are rendered as objects via _asdict, built one
+    row at a time during encoding; other types orjson does not handle
+    natively (e.g. Decimal) fall back to str. request.get_json() also
+    decodes through this provider.
+    """
+
+    @staticmethod
+    def _default(obj):
+        if hasattr(obj, '_asdict'):
+            return obj._asdict()
+        return str(obj)
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self._default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key')
+app.json = OrjsonProvider(app)
+
+# Static assets are cache-busted with a content hash (see static_url), so
+# the browser can cache them for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
 
 # Initialize database
 DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://dashboard:dashboardpass@db:5432/dashboard')
 db = DatabaseManager(DATABASE_URL)
 db.initialize_pool()
 
+# Covering indexes for the user_items joins and per-item usage scans;
+# created here so existing deployments pick them up without a manual
+# migration (new deployments get them from init_db.sql)
+db.ensure_indexes([
+    '''CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_items_user_item
+       ON user_items(user_id, item_id) INCLUDE (display_order)''',
+    '''CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usage_tracking_item_clicked
+       ON usage_tracking(item_id, clicked_at)''',
+])
+
+# Assignment batches larger than this go through COPY instead of INSERT
+COPY_THRESHOLD = 200
+
+# Per-user cache of dashboard item payloads, invalidated when assignments
+# or items change
+dashboard_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+dashboard_cache_lock = threading.Lock()
+
+# Load the session user into g once per request; decorators and route
+# bodies read g.user instead of hitting the session repeatedly
+app.before_request(load_user_from_session)
+
 # Disable caching for instant updates
 @app.after_request
 def add_no_cache_headers(response):
-    """Add no-cache headers to all responses"""
-    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
+    """Default responses to no-cache unless the route opted into caching"""
+    if 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
     return response
 
 
+# Content hashes of static files, computed once per process
+static_hashes: dict = {}
+
+
+@app.template_global()
+def static_url(filename):
+    """URL for a static file with a content-hash query for cache busting"""
+    version = static_hashes.get(filename)
+    if version is None:
+        path = os.path.join(app.static_folder, filename)
+        try:
+            with open(path, 'rb') as f:
+                version = hashlib.sha1(f.read()).hexdigest()[:8]
+        except OSError:
+            version = '0'
+        static_hashes[filename] = version
+    return url_for('static', filename=filename, v=version)
+
+
+def conditional_json(payload):
+    """Return a JSON response with an ETag, honoring If-None-Match with 304"""
+    response = jsonify(payload)
+    response.set_etag(hashlib.sha1(response.get_data()).hexdigest())
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
 # ============================================================================
 # Authentication Routes
 # ============================================================================
@@ -56,25 +147,44 @@ def login():
             return jsonify({'error': 'Username and password required'}), 400
 
         # Get user from database
-        user = db.execute_one(
-            'SELECT * FROM users WHERE username = %s', (username,)
+        user = db.execute_prepared(
+            'login_user',
+            '''SELECT id, username, password_hash, is_admin, must_change_password
+               FROM users WHERE username = $1''',
+            (username,),
+            one=True,
         )
 
-        if not user or not verify_password(password, user['password_hash']):
+        if not user:
+            # Unknown user: burn a verification so the timing matches
+            dummy_verify(password)
+            return jsonify({'error': 'Invalid username or password'}), 401
+
+        if not verify_password_async(password, user['password_hash']):
             return jsonify({'error': 'Invalid username or password'}), 401
 
+        # Lazily migrate legacy bcrypt hashes to argon2
+        new_hash = None
+        if needs_rehash(user['password_hash']):
+            new_hash = hash_password_async(password)
+
         # Set session
         session['user_id'] = user['id']
         session['username'] = user['username']
         session['is_admin'] = user['is_admin']
         session['must_change_password'] = user['must_change_password']
 
-        # Update last login
-        db.execute_query(
-            'UPDATE users SET last_login = NOW() WHERE id = %s',
-            (user['id'],),
-            fetch=False,
-        )
+        # Update last login (and migrated hash) in one transaction
+        with db.transaction() as cur:
+            if new_hash:
+                cur.execute(
+                    'UPDATE users SET password_hash = %s WHERE id = %s',
+                    (new_hash, user['id']),
+                )
+            cur.execute(
+                'UPDATE users SET last_login = NOW() WHERE id = %s',
+                (user['id'],),
+            )
 
         # Determine redirect
         if user['must_change_password']:
@@ -95,7 +205,7 @@ def logout():
 
 
 @app.route('/change-password', methods=['GET', 'POST'])
-@login_required
+@html_login_required
 def change_password():
     """Change password page"""
     if request.method == 'POST':
@@ -115,31 +225,29 @@ def change_password():
 
         # Get current user
         user = db.execute_one(
-            'SELECT * FROM users WHERE id = %s', (session['user_id'],)
+            'SELECT id, password_hash FROM users WHERE id = %s',
+            (g.user['id'],),
         )
 
-        if not verify_password(current_password, user['password_hash']):
+        if not verify_password_async(current_password, user['password_hash']):
             return jsonify({'error': 'Current password incorrect'}), 401
 
-        # Update password
-        new_hash = hash_password(new_password)
-        db.execute_query(
-            'UPDATE users SET password_hash = %s, must_change_password = FALSE WHERE id = %s',
-            (new_hash, session['user_id']),
-            fetch=False,
-        )
-
-        # Log password change
-        db.execute_query(
-            'INSERT INTO password_change_history (user_id, changed_by) VALUES (%s, %s)',
-            (session['user_id'], session['user_id']),
-            fetch=False,
-        )
+        # Update password and log the change in one transaction
+        new_hash = hash_password_async(new_password)
+        with db.transaction() as cur:
+            cur.execute(
+                'UPDATE users SET password_hash = %s, must_change_password = FALSE WHERE id = %s',
+                (new_hash, g.user['id']),
+            )
+            cur.execute(
+                'INSERT INTO password_change_history (user_id, changed_by) VALUES (%s, %s)',
+                (g.user['id'], g.user['id']),
+            )
 
         session['must_change_password'] = False
 
         # Redirect based on role
-        redirect_url = '/admin/users' if session.get('is_admin') else '/dashboard'
+        redirect_url = '/admin/users' if g.user['is_admin'] else '/dashboard'
         return jsonify({'redirect': redirect_url})
 
     return render_template('change_password.html')
@@ -151,30 +259,30 @@ def change_password():
 
 
 @app.route('/')
-@login_required
+@html_login_required
 def index():
     """Redirect to appropriate dashboard"""
-    if session.get('must_change_password'):
+    if g.user['must_change_password']:
         return redirect(url_for('change_password'))
-    if session.get('is_admin'):
+    if g.user['is_admin']:
         return redirect(url_for('admin_users'))
     return redirect(url_for('dashboard'))
 
 
 @app.route('/dashboard')
-@login_required
+@html_login_required
 def dashboard():
     """User dashboard page"""
-    if session.get('must_change_password'):
+    if g.user['must_change_password']:
         return redirect(url_for('change_password'))
     return render_template('dashboard.html')
 
 
 @app.route('/tool/<int:item_id>')
-@login_required
+@html_login_required
 def tool_viewer(item_id):
     """Tool viewer page with iframe"""
-    if session.get('must_change_password'):
+    if g.user['must_change_password']:
         return redirect(url_for('change_password'))
 
     # Verify user has access to this item
@@ -182,7 +290,7 @@ def tool_viewer(item_id):
         '''SELECT di.* FROM dashboard_items di
            JOIN user_items ui ON di.id = ui.item_id
            WHERE di.id = %s AND ui.user_id = %s''',
-        (item_id, session['user_id']),
+        (item_id, g.user['id']),
     )
 
     if not user_item:
@@ -197,21 +305,21 @@ def tool_viewer(item_id):
 
 
 @app.route('/admin/users')
-@admin_required
+@html_admin_required
 def admin_users():
     """Admin user management page"""
     return render_template('admin_users.html')
 
 
 @app.route('/admin/items')
-@admin_required
+@html_admin_required
 def admin_items():
     """Admin dashboard items page"""
     return render_template('admin_items.html')
 
 
 @app.route('/admin/analytics')
-@admin_required
+@html_admin_required
 def admin_analytics():
     """Admin analytics page"""
     return render_template('admin_analytics.html')
@@ -223,10 +331,10 @@ def admin_analytics():
 
 
 @app.route('/api/auth/me')
-@login_required
+@api_login_required
 def api_me():
     """Get current user info"""
-    return jsonify(get_current_user())
+    return conditional_json(get_current_user())
 
 
 # ============================================================================
@@ -235,29 +343,36 @@ def api_me():
 
 
 @app.route('/api/dashboard/items')
-@login_required
+@api_login_required
 def api_dashboard_items():
     """Get user's assigned dashboard items"""
-    items = db.execute_query(
-        '''SELECT di.*, ui.display_order
-           FROM dashboard_items di
-           JOIN user_items ui ON di.id = ui.item_id
-           WHERE ui.user_id = %s
-           ORDER BY ui.display_order, di.name''',
-        (session['user_id'],),
-    )
-    return jsonify(items or [])
+    user_id = g.user['id']
+    with dashboard_cache_lock:
+        items = dashboard_cache.get(user_id)
+    if items is None:
+        items = db.execute_prepared(
+            'dashboard_items_for_user',
+            '''SELECT di.*, ui.display_order
+               FROM dashboard_items di
+               JOIN user_items ui ON di.id = ui.item_id
+               WHERE ui.user_id = $1
+               ORDER BY ui.display_order, di.name''',
+            (user_id,),
+        ) or []
+        with dashboard_cache_lock:
+            dashboard_cache[user_id] = items
+    return conditional_json(items)
 
 
 @app.route('/api/dashboard/item/<int:item_id>')
-@login_required
+@api_login_required
 def api_dashboard_item(item_id):
     """Get specific dashboard item"""
     item = db.execute_one(
         '''SELECT di.* FROM dashboard_items di
            JOIN user_items ui ON di.id = ui.item_id
            WHERE di.id = %s AND ui.user_id = %s''',
-        (item_id, session['user_id']),
+        (item_id, g.user['id']),
     )
     if not item:
         return jsonify({'error': 'Item not found or access denied'}), 404
@@ -270,7 +385,7 @@ def api_dashboard_item(item_id):
 
 
 @app.route('/api/usage/start', methods=['POST'])
-@login_required
+@api_login_required
 def api_usage_start():
     """Start usage tracking session"""
     data = request.get_json()
@@ -280,18 +395,20 @@ def api_usage_start():
         return jsonify({'error': 'item_id required'}), 400
 
     # Insert usage record
-    result = db.execute_insert(
+    result = db.execute_prepared(
+        'usage_start',
         '''INSERT INTO usage_tracking (user_id, item_id, session_start)
-           VALUES (%s, %s, NOW())
+           VALUES ($1, $2, NOW())
            RETURNING id''',
-        (session['user_id'], item_id),
+        (g.user['id'], item_id),
+        one=True,
     )
 
     return jsonify({'session_id': result['id']})
 
 
 @app.route('/api/usage/end', methods=['POST'])
-@login_required
+@api_login_required
 def api_usage_end():
     """End usage tracking session"""
     data = request.get_json()
@@ -300,18 +417,24 @@ def api_usage_end():
     if not session_id:
         return jsonify({'error': 'session_id required'}), 400
 
-    # Update usage record with end time and duration
-    db.execute_query(
+    # Queue the write so the client (usually a beforeunload beacon that
+    # ignores the response anyway) is answered immediately
+    tasks.enqueue(end_usage_job, session_id, g.user['id'])
+    return jsonify({'success': True}), 202
+
+
+def end_usage_job(session_id, user_id):
+    """Close a usage session with its duration (runs on the job worker)"""
+    db.execute_prepared(
+        'usage_end',
         '''UPDATE usage_tracking
            SET session_end = NOW(),
                duration_seconds = EXTRACT(EPOCH FROM (NOW() - session_start))::INTEGER
-           WHERE id = %s AND user_id = %s''',
-        (session_id, session['user_id']),
+           WHERE id = $1 AND user_id = $2''',
+        (session_id, user_id),
         fetch=False,
     )
 
-    return jsonify({'success': True})
-
 
 # ============================================================================
 # API Endpoints - Admin Users
@@ -319,7 +442,7 @@ def api_usage_end():
 
 
 @app.route('/api/admin/users', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_users_list():
     """Get all users"""
     users = db.execute_query(
@@ -331,7 +454,7 @@ def api_admin_users_list():
 
 
 @app.route('/api/admin/users', methods=['POST'])
-@admin_required
+@api_admin_required
 def api_admin_users_create():
     """Create new user"""
     data = request.get_json()
@@ -348,23 +471,40 @@ def api_admin_users_create():
     if len(password) < 6:
         return jsonify({'error': 'Password must be at least 6 characters'}), 400
 
+    # Hashing and the insert run on the job worker so admin requests are
+    # never blocked behind password hashing; the client polls the job id
+    job_id = tasks.enqueue(create_user_job, username, password, is_admin)
+    return jsonify({'job_id': job_id}), 202
+
+
+def create_user_job(username, password, is_admin):
+    """Hash the password and insert the user (runs on the job worker)"""
+    password_hash = hash_password_async(password)
     try:
-        password_hash = hash_password(password)
-        result = db.execute_insert(
+        return db.execute_insert(
             '''INSERT INTO users (username, password_hash, is_admin, must_change_password)
                VALUES (%s, %s, %s, TRUE)
                RETURNING id, username, is_admin, created_at''',
             (username, password_hash, is_admin),
         )
-        return jsonify(result), 201
     except Exception as e:
         if 'duplicate key' in str(e).lower():
-            return jsonify({'error': 'Username already exists'}), 409
-        return jsonify({'error': str(e)}), 500
+            raise ValueError('Username already exists') from e
+        raise
+
+
+@app.route('/api/admin/jobs/<job_id>', methods=['GET'])
+@api_admin_required
+def api_admin_job_status(job_id):
+    """Get status of a background job"""
+    job = tasks.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
 
 
 @app.route('/api/admin/users/<int:user_id>', methods=['PUT'])
-@admin_required
+@api_admin_required
 def api_admin_users_update(user_id):
     """Update user"""
     data = request.get_json()
@@ -379,20 +519,19 @@ def api_admin_users_update(user_id):
         if new_password:
             if len(new_password) < 6:
                 return jsonify({'error': 'Password must be at least 6 characters'}), 400
-            password_hash = hash_password(new_password)
-            db.execute_query(
-                '''UPDATE users
-                   SET username = %s, is_admin = %s, password_hash = %s, must_change_password = TRUE
-                   WHERE id = %s''',
-                (username, is_admin, password_hash, user_id),
-                fetch=False,
-            )
-            # Log password change
-            db.execute_query(
-                'INSERT INTO password_change_history (user_id, changed_by) VALUES (%s, %s)',
-                (user_id, session['user_id']),
-                fetch=False,
-            )
+            password_hash = hash_password_async(new_password)
+            with db.transaction() as cur:
+                cur.execute(
+                    '''UPDATE users
+                       SET username = %s, is_admin = %s, password_hash = %s, must_change_password = TRUE
+                       WHERE id = %s''',
+                    (username, is_admin, password_hash, user_id),
+                )
+                # Log password change
+                cur.execute(
+                    'INSERT INTO password_change_history (user_id, changed_by) VALUES (%s, %s)',
+                    (user_id, g.user['id']),
+                )
         else:
             db.execute_query(
                 'UPDATE users SET username = %s, is_admin = %s WHERE id = %s',
@@ -408,19 +547,21 @@ def api_admin_users_update(user_id):
 
 
 @app.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
-@admin_required
+@api_admin_required
 def api_admin_users_delete(user_id):
     """Delete user"""
     # Prevent deleting yourself
-    if user_id == session['user_id']:
+    if user_id == g.user['id']:
         return jsonify({'error': 'Cannot delete your own account'}), 400
 
     db.execute_query('DELETE FROM users WHERE id = %s', (user_id,), fetch=False)
+    with dashboard_cache_lock:
+        dashboard_cache.pop(user_id, None)
     return jsonify({'success': True})
 
 
 @app.route('/api/admin/users/<int:user_id>/items', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_user_items_get(user_id):
     """Get user's assigned items"""
     items = db.execute_query(
@@ -430,25 +571,57 @@ def api_admin_user_items_get(user_id):
 
 
 @app.route('/api/admin/users/<int:user_id>/items', methods=['POST'])
-@admin_required
+@api_admin_required
 def api_admin_user_items_update(user_id):
     """Update user's assigned items"""
     data = request.get_json()
     item_ids = data.get('item_ids', [])
 
-    # Delete existing assignments
-    db.execute_query(
-        'DELETE FROM user_items WHERE user_id = %s', (user_id,), fetch=False
-    )
+    # Upsert the new assignment set in one transaction: rows that are kept
+    # only get their display_order updated, so a re-save or reorder does not
+    # churn every row the way the old DELETE-then-INSERT did
+    merge_sql = '''MERGE INTO user_items ui
+                   USING {source} AS v(user_id, item_id, display_order)
+                   ON ui.user_id = v.user_id AND ui.item_id = v.item_id
+                   WHEN MATCHED THEN
+                       UPDATE SET display_order = v.display_order
+                   WHEN NOT MATCHED THEN
+                       INSERT (user_id, item_id, display_order)
+                       VALUES (v.user_id, v.item_id, v.display_order)'''
+    rows = [(user_id, int(item_id), idx) for idx, item_id in enumerate(item_ids)]
+
+    with db.transaction() as cur:
+        if not rows:
+            cur.execute('DELETE FROM user_items WHERE user_id = %s', (user_id,))
+        else:
+            if len(rows) > COPY_THRESHOLD:
+                # COPY the batch into a temp table and MERGE from it,
+                # skipping per-row parse/plan cost for large re-assignments
+                cur.execute(
+                    '''CREATE TEMP TABLE new_user_items
+                       (user_id INTEGER, item_id INTEGER, display_order INTEGER)
+                       ON COMMIT DROP'''
+                )
+                buffer = io.StringIO()
+                for row in rows:
+                    buffer.write('%d\t%d\t%d\n' % row)
+                buffer.seek(0)
+                cur.copy_expert('COPY new_user_items FROM STDIN', buffer)
+                cur.execute(merge_sql.format(source='new_user_items'))
+            else:
+                execute_values(
+                    cur,
+                    merge_sql.format(source='(VALUES %s)'),
+                    rows,
+                    page_size=500,
+                )
+            cur.execute(
+                'DELETE FROM user_items WHERE user_id = %s AND item_id <> ALL(%s)',
+                (user_id, [row[1] for row in rows]),
+            )
 
-    # Insert new assignments
-    for idx, item_id in enumerate(item_ids):
-        db.execute_query(
-            '''INSERT INTO user_items (user_id, item_id, display_order)
-               VALUES (%s, %s, %s)''',
-            (user_id, item_id, idx),
-            fetch=False,
-        )
+    with dashboard_cache_lock:
+        dashboard_cache.pop(user_id, None)
 
     return jsonify({'success': True})
 
@@ -459,20 +632,22 @@ def api_admin_user_items_update(user_id):
 
 
 @app.route('/api/admin/items', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_items_list():
     """Get all dashboard items"""
     items = db.execute_query(
-        '''SELECT di.*,
-           (SELECT COUNT(*) FROM user_items WHERE item_id = di.id) as user_count
+        '''SELECT di.*, COALESCE(c.n, 0) as user_count
            FROM dashboard_items di
+           LEFT JOIN (SELECT item_id, COUNT(*) as n
+                      FROM user_items
+                      GROUP BY item_id) c ON c.item_id = di.id
            ORDER BY di.category, di.name'''
     )
     return jsonify(items or [])
 
 
 @app.route('/api/admin/items', methods=['POST'])
-@admin_required
+@api_admin_required
 def api_admin_items_create():
     """Create new dashboard item"""
     data = request.get_json()
@@ -490,13 +665,13 @@ def api_admin_items_create():
         '''INSERT INTO dashboard_items (name, description, url, icon, category, open_in_new_window, created_by)
            VALUES (%s, %s, %s, %s, %s, %s, %s)
            RETURNING *''',
-        (name, description, url, icon, category, open_in_new_window, session['user_id']),
+        (name, description, url, icon, category, open_in_new_window, g.user['id']),
     )
     return jsonify(result), 201
 
 
 @app.route('/api/admin/items/<int:item_id>', methods=['PUT'])
-@admin_required
+@api_admin_required
 def api_admin_items_update(item_id):
     """Update dashboard item"""
     data = request.get_json()
@@ -517,21 +692,25 @@ def api_admin_items_update(item_id):
         (name, description, url, icon, category, open_in_new_window, item_id),
         fetch=False,
     )
+    with dashboard_cache_lock:
+        dashboard_cache.clear()
     return jsonify({'success': True})
 
 
 @app.route('/api/admin/items/<int:item_id>', methods=['DELETE'])
-@admin_required
+@api_admin_required
 def api_admin_items_delete(item_id):
     """Delete dashboard item"""
     db.execute_query(
         'DELETE FROM dashboard_items WHERE id = %s', (item_id,), fetch=False
     )
+    with dashboard_cache_lock:
+        dashboard_cache.clear()
     return jsonify({'success': True})
 
 
 @app.route('/api/admin/items/<int:item_id>/users', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_item_users(item_id):
     """Get users assigned to an item"""
     users = db.execute_query(
@@ -551,7 +730,7 @@ def api_admin_item_users(item_id):
 
 
 @app.route('/api/admin/analytics/summary', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_analytics_summary():
     """Get analytics summary statistics"""
     summary = db.execute_one(
@@ -566,7 +745,7 @@ def api_admin_analytics_summary():
 
 
 @app.route('/api/admin/analytics/top-tools', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_analytics_top_tools():
     """Get most-clicked tools"""
     limit = request.args.get('limit', 10, type=int)
@@ -590,29 +769,44 @@ def api_admin_analytics_top_tools():
     query += ' GROUP BY di.id, di.name, di.icon ORDER BY click_count DESC LIMIT %s'
     params.append(limit)
 
-    tools = db.execute_query(query, tuple(params))
+    tools = db.execute_query(query, tuple(params), fetch_mode='ntuple')
     return jsonify(tools or [])
 
 
 @app.route('/api/admin/analytics/user-activity', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_analytics_user_activity():
     """Get user activity over time"""
     days = request.args.get('days', 30, type=int)
 
+    # Emit one row per day, including days with no sessions, so the chart
+    # does not have to fill gaps client-side
     activity = db.execute_query(
-        '''SELECT DATE(clicked_at) as date, COUNT(*) as session_count
-           FROM usage_tracking
-           WHERE clicked_at >= NOW() - INTERVAL '%s days'
-           GROUP BY DATE(clicked_at)
-           ORDER BY date''',
-        (days,),
+        '''WITH days AS (
+               SELECT generate_series(
+                   CURRENT_DATE - make_interval(days => %s),
+                   CURRENT_DATE,
+                   '1 day'
+               )::date as date
+           ),
+           sessions AS (
+               SELECT DATE(clicked_at) as date, COUNT(*) as session_count
+               FROM usage_tracking
+               WHERE clicked_at >= CURRENT_DATE - make_interval(days => %s)
+               GROUP BY DATE(clicked_at)
+           )
+           SELECT days.date, COALESCE(s.session_count, 0) as session_count
+           FROM days
+           LEFT JOIN sessions s ON s.date = days.date
+           ORDER BY days.date''',
+        (days, days),
+        fetch_mode='ntuple',
     )
     return jsonify(activity or [])
 
 
 @app.route('/api/admin/analytics/recent', methods=['GET'])
-@admin_required
+@api_admin_required
 def api_admin_analytics_recent():
     """Get recent activity log"""
     limit = request.args.get('limit', 50, type=int)
@@ -625,6 +819,7 @@ def api_admin_analytics_recent():
            ORDER BY ut.clicked_at DESC
            LIMIT %s''',
         (limit,),
+        fetch_mode='ntuple',
     )
     return jsonify(recent or [])
 
@@ -164,6 +164,12 @@ async function handleUserSubmit(e) {
       throw new Error(error.error || 'Failed to save user');
     }
 
+    // Creation runs as a background job; wait for it before reloading
+    if (response.status === 202) {
+      const { job_id } = await response.json();
+      await waitForJob(job_id);
+    }
+
     document.getElementById('userModal').style.display = 'none';
     await loadUsers();
     showToast(`User ${editingUserId ? 'updated' : 'created'} successfully`, 'success');
@@ -172,6 +178,21 @@ async function handleUserSubmit(e) {
   }
 }
 
+/**
+ * Poll a background job until it finishes
+ */
+async function waitForJob(jobId) {
+  for (let i = 0; i < 50; i++) {
+    const response = await fetch(`/api/admin/jobs/${jobId}`);
+    if (!response.ok) throw new Error('Failed to check job status');
+    const job = await response.json();
+    if (job.status === 'finished') return job.result;
+    if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+    await new Promise((resolve) => setTimeout(resolve, 200));
+  }
+  throw new Error('Timed out waiting for job');
+}
+
 /**
  * Delete user
  */
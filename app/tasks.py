@@ -0,0 +1,53 @@
+"""In-process background job queue for work that should not block requests"""
+
+import logging
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Optional
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Job results are kept for an hour so clients have time to poll them
+_jobs: TTLCache = TTLCache(maxsize=1_000, ttl=3600)
+_jobs_lock = threading.Lock()
+_job_queue: queue.Queue = queue.Queue()
+
+
+def _worker() -> None:
+    """Drain the queue, recording each job's outcome in the registry"""
+    while True:
+        job_id, func, args = _job_queue.get()
+        try:
+            result = func(*args)
+            status, error = 'finished', None
+        except Exception as e:
+            result, status, error = None, 'failed', str(e)
+            # Fire-and-forget jobs (e.g. usage-end writes) are never
+            # polled, so the registry entry alone would expire unseen
+            logger.exception('Background job %s (%s) failed', job_id, func.__name__)
+        with _jobs_lock:
+            if job_id in _jobs:
+                _jobs[job_id].update(status=status, result=result, error=error)
+        _job_queue.task_done()
+
+
+_worker_thread = threading.Thread(target=_worker, daemon=True, name='job-worker')
+_worker_thread.start()
+
+
+def enqueue(func: Callable, *args) -> str:
+    """Queue a callable and return a job id for status polling"""
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _jobs[job_id] = {'status': 'queued', 'result': None, 'error': None}
+    _job_queue.put((job_id, func, args))
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[dict[str, Any]]:
+    """Get a snapshot of a job's status, or None if unknown/expired"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
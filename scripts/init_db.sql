@@ -69,6 +69,8 @@ CREATE INDEX IF NOT EXISTS idx_usage_tracking_user_id ON usage_tracking(user_id)
 CREATE INDEX IF NOT EXISTS idx_usage_tracking_item_id ON usage_tracking(item_id);
 CREATE INDEX IF NOT EXISTS idx_usage_tracking_clicked_at ON usage_tracking(clicked_at DESC);
 CREATE INDEX IF NOT EXISTS idx_dashboard_items_category ON dashboard_items(category);
+CREATE INDEX IF NOT EXISTS idx_user_items_user_item ON user_items(user_id, item_id) INCLUDE (display_order);
+CREATE INDEX IF NOT EXISTS idx_usage_tracking_item_clicked ON usage_tracking(item_id, clicked_at);
 
 -- Insert default admin user (password: admin)
 -- Password hash generated with bcrypt (cost factor 12)